@@ -1,55 +1,442 @@
 import streamlit as st
-import whisper
-import yt_dlp
-from pytube import YouTube
-import tempfile
+import copy
+import hashlib
 import os
+import re
 import time
 from typing import List, Dict
-import json
+import orjson
 import uuid
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime
-import speech_recognition as sr
-from pydub import AudioSegment
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import numpy as np
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+
+
+_FMT_DATE = "%Y-%m-%d"
+_FMT_DATETIME = "%Y-%m-%d %H:%M:%S"
+_FMT_DATETIME_MINUTES = "%Y-%m-%d %H:%M"
+_FMT_TIME = "%H:%M:%S"
+
+_WHISPER_BATCH_SIZE = 16
+
+# Finished transcripts, keyed by source content/URL so repeat requests are a disk read
+_TRANSCRIPT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "transcripts")
+
+# Project state autosave: one file per project, written after mutations at most every _AUTOSAVE_INTERVAL seconds
+_AUTOSAVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "projects")
+_AUTOSAVE_INTERVAL = 5.0
+_AUTOSAVE_KEYS = (
+    "current_project", "current_genre", "script_content", "script_versions", "research_materials",
+    "transcripts", "storyboard_scenes", "scene_order", "team_members", "tasks", "comments"
+)
+
+_FALLBACK_PLAYER_CLIENTS = ("mediaconnect", "android", "ios")
+
+_SCENE_HEADING_PREFIXES = ("INT.", "EXT.")
+
+_CSS = """
+<style>
+.main-header {
+    font-size: 3rem;
+    color: #1f77b4;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.creative-card {
+    padding: 1.5rem;
+    border-radius: 10px;
+    background-color: #f8f9fa;
+    border-left: 5px solid #4CAF50;
+    margin: 10px 0;
+}
+</style>
+"""
+
+_COMMENT_MD = "**{author}** ({timestamp}):\n\n{text}\n\n---\n\n"
+
+# Comments kept per section (oldest pruned first) and how many of the newest are rendered
+_MAX_COMMENTS_PER_SECTION = 500
+_COMMENTS_SHOWN = 50
+
+
+@dataclass(slots=True)
+class Scene:
+    id: int
+    title: str
+    description: str
+    notes: str
+    keys: Dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Widget keys are built once per scene rather than on every rerun
+        self.keys = {name: f"{name}_{self.id}" for name in ("desc", "notes", "up", "down", "del")}
+
+
+@dataclass(slots=True)
+class Task:
+    id: str
+    description: str
+    assignee: str
+    due_date: str
+    completed: bool
+    created: str
+
+
+# Task table columns; passed explicitly so the editor keeps its schema when there are no tasks
+_TASK_COLUMNS = tuple(f.name for f in fields(Task))
+
+
+@dataclass(slots=True)
+class Comment:
+    id: str
+    text: str
+    author: str
+    timestamp: float
+    section: str
+
+
+@st.cache_resource(show_spinner=False)
+def _get_whisper_model(name: str = "base"):
+    """Load a Whisper model once per process and reuse it across reruns"""
+    import ctranslate2
+    from faster_whisper import WhisperModel
+
+    # int8 weights everywhere; fp16 activations on GPU where tensor cores accelerate them
+    if ctranslate2.get_cuda_device_count() > 0:
+        return WhisperModel(name, device="cuda", compute_type="int8_float16", num_workers=2)
+    # Split the cores across workers so intra x inter threads never exceeds the core count
+    num_workers = 2
+    return WhisperModel(name, device="cpu", compute_type="int8",
+                        cpu_threads=max(1, (os.cpu_count() or 1) // num_workers), num_workers=num_workers)
+
+
+def _segment_to_dict(segment) -> Dict:
+    """Convert a faster-whisper segment into the transcript segment schema"""
+    return {
+        "start": segment.start,
+        "end": segment.end,
+        "text": segment.text,
+        "words": [
+            {"start": w.start, "end": w.end, "word": w.word, "probability": w.probability}
+            for w in (segment.words or [])
+        ]
+    }
+
+
+def _decode_audio(source, ffmpeg: str = "ffmpeg") -> np.ndarray:
+    """Decode media bytes (or a readable pipe) to 16kHz mono float32 PCM with a single ffmpeg pipe"""
+    stdin = {"input": source} if isinstance(source, bytes) else {"stdin": source}
+    proc = subprocess.run(
+        [ffmpeg, "-loglevel", "error", "-i", "pipe:0",
+         "-f", "s16le", "-ac", "1", "-ar", "16000", "-"],
+        capture_output=True, check=True, **stdin
+    )
+    return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def _transcribe_audio(audio: np.ndarray):
+    """Run batched Whisper inference over 30s VAD chunks, yielding segments lazily"""
+    from faster_whisper import BatchedInferencePipeline
+
+    # The pipeline keeps per-run state, so each call gets its own thin wrapper around the shared model
+    pipeline = BatchedInferencePipeline(model=_get_whisper_model("base"))
+    segments, info = pipeline.transcribe(
+        audio, batch_size=_WHISPER_BATCH_SIZE, chunk_length=30, beam_size=1,
+        word_timestamps=True, vad_filter=True
+    )
+    return segments
+
+
+def _stream_segments(segments) -> List[Dict]:
+    """Drain the lazy segment generator, appending each segment to a placeholder as it is decoded"""
+    placeholder = st.empty()
+    # Append one element per segment so each update sends only the new line
+    container = placeholder.container()
+    parts = []
+    for segment in segments:
+        part = _segment_to_dict(segment)
+        parts.append(part)
+        container.markdown(f"`{_format_timestamp(part['start'])}` {part['text'].strip()}")
+    placeholder.empty()
+    return parts
+
+
+class _StatusLog:
+    """Transcription status sink; buffered on pool threads, which must not call st.*"""
+
+    def __init__(self, buffered: bool = False):
+        self.buffered = buffered
+        self.messages = []
+
+    def _emit(self, level: str, text: str):
+        if self.buffered:
+            self.messages.append((level, text))
+        else:
+            getattr(st, level)(text)
+
+    def info(self, text: str):
+        self._emit("info", text)
+
+    def success(self, text: str):
+        self._emit("success", text)
+
+    def error(self, text: str):
+        self._emit("error", text)
+
+    def collect_segments(self, segments) -> List[Dict]:
+        """Drain segments, streaming them into the page only when running on the script thread"""
+        if self.buffered:
+            return [_segment_to_dict(segment) for segment in segments]
+        return _stream_segments(segments)
+
+    def replay(self):
+        """Render buffered messages; call from the script thread"""
+        for level, text in self.messages:
+            getattr(st, level)(text)
+
+
+def _transcript_cache_path(*key_parts) -> str:
+    """On-disk location of a cached transcript, addressed by a hash of its source"""
+    digest = hashlib.sha256()
+    for part in key_parts:
+        digest.update(part if isinstance(part, bytes) else part.encode())
+        digest.update(b"\0")
+    return os.path.join(_TRANSCRIPT_CACHE_DIR, f"{digest.hexdigest()}.json")
+
+
+def _load_cached_transcript(path: str):
+    """Previously stored transcript, or None on a miss"""
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _store_cached_transcript(path: str, transcript_data: Dict):
+    """Persist a finished transcript; the cache is best-effort, so write failures are ignored"""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(_TRANSCRIPT_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(transcript_data))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _format_epoch(seconds: float, fmt: str) -> str:
+    """Format an epoch timestamp in local time"""
+    return datetime.fromtimestamp(seconds).strftime(fmt)
+
+
+def _format_timestamp(seconds: float) -> str:
+    """Format seconds as MM:SS"""
+    return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+
+
+@st.cache_data(show_spinner=False)
+def _serialize_transcript(transcript_id: str, _segments: List[Dict]) -> str:
+    """Plain-text transcript, cached on the transcript id; the segments are left unhashed"""
+    return "\n".join(f"[{seg['start']:.2f}s] {seg['text']}" for seg in _segments)
+
+
+@st.cache_data(show_spinner=False)
+def _transcript_columns(transcript_id: str, _segments: List[Dict]) -> Dict[str, List]:
+    """Columnar timestamp/text view of a transcript for st.dataframe, cached on the transcript id"""
+    return {
+        "ts": [_format_timestamp(seg['start']) for seg in _segments],
+        "text": [seg['text'].strip() for seg in _segments]
+    }
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _ai_suggestions(script_text: str) -> List[Dict]:
+    """Rule-based script suggestions, memoized on the script text"""
+    if len(script_text.strip()) < 50:
+        return [{
+            "type": "📝 Getting Started",
+            "text": "Start writing your screenplay! I'll provide specific suggestions as you develop your story.",
+            "confidence": 95
+        }]
+
+    suggestions = []
+
+    # Analyze content in a single pass
+    word_count = 0
+    dialogue_count = 0
+    has_scene_heading = False
+    characters = set()
+    for line in script_text.splitlines():
+        word_count += len(line.split())
+        if line.lstrip().startswith(_SCENE_HEADING_PREFIXES):
+            has_scene_heading = True
+        colon = line.find(':')
+        if colon >= 0:
+            dialogue_count += 1
+            characters.add(line[:colon].strip())
+
+    # Dialogue analysis
+    if not dialogue_count and word_count > 100:
+        suggestions.append({
+            "type": "💬 Dialogue Opportunity",
+            "text": "Consider adding character dialogue to reveal relationships and advance the plot.",
+            "confidence": 88
+        })
+
+    # Structure analysis
+    if not has_scene_heading:
+        suggestions.append({
+            "type": "🏗️ Structure",
+            "text": "Add scene headings: 'INT. LOCATION - TIME' for professional formatting.",
+            "confidence": 92
+        })
+
+    # Character analysis
+    if dialogue_count and len(characters) == 1:
+        suggestions.append({
+            "type": "👤 Character Development",
+            "text": f"Add more characters to create dialogue exchanges and conflict.",
+            "confidence": 85
+        })
+
+    return suggestions[:3]
+
+
+def _project_report(project: str, script_words: int, research_items: int, storyboard_scenes: int,
+                    team_members: int) -> Dict:
+    """Project summary built from the cached session counts"""
+    return {
+        "project": project,
+        "script_words": script_words,
+        "research_items": research_items,
+        "storyboard_scenes": storyboard_scenes,
+        "team_members": team_members,
+        "completion_estimate": "65%"
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def _find_ffmpeg():
+    """Resolve the ffmpeg binary once per process; None if nothing usable is found"""
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+
+    if sys.platform == "win32":
+        # Windows - common installation paths
+        possible_paths = [
+            r"C:\ffmpeg\bin\ffmpeg.exe",
+            r"C:\Program Files\ffmpeg\bin\ffmpeg.exe"
+        ]
+    else:
+        # Linux/Mac
+        possible_paths = ["/usr/bin/ffmpeg", "/usr/local/bin/ffmpeg"]
+
+    return next((path for path in possible_paths if os.path.isfile(path)), None)
+
+
+def _autosave_default(obj):
+    """orjson fallback for autosave: dataclasses saved by their init fields, leaving out derived ones"""
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj) if f.init}
+    raise TypeError
+
+
+def _autosave_path(project: str) -> str:
+    """Autosave file for a project name"""
+    name = re.sub(r"[^\w-]+", "_", project).strip("_") or "untitled"
+    return os.path.join(_AUTOSAVE_DIR, f"{name}.json")
+
+
+class _AutosaveWriter:
+    """Throttled project writer; holds the latest snapshot and serializes it only when a write happens"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.path = None
+        self.state = None
+        self.timer = None
+        self.next_write = 0.0
+        self.error = None
+
+    def submit(self, path: str, state: Dict):
+        """Queue a shallow snapshot, writing now or when the throttle window closes"""
+        with self.lock:
+            self.path, self.state = path, state
+            if self.timer is not None:
+                # A trailing write is already armed and will pick up this snapshot
+                return
+            delay = self.next_write - time.monotonic()
+            if delay > 0:
+                self.timer = threading.Timer(delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """Write the queued snapshot, if any; runs on the script thread or the trailing timer"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            path, state, self.state = self.path, self.state, None
+            if state is None:
+                return
+            self.next_write = time.monotonic() + _AUTOSAVE_INTERVAL
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            try:
+                data = orjson.dumps(
+                    state,
+                    default=_autosave_default,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+                )
+                os.makedirs(_AUTOSAVE_DIR, exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                self.error = e
+
+    def discard(self, path: str):
+        """Drop any queued snapshot and remove the file at path, e.g. after a project rename"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.state = None
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.error = e
 
 
 class AIPreProductionStudio:
     def __init__(self):
+        self.ffmpeg_path = "ffmpeg"
         self.init_session_state()
         self.setup_ffmpeg()
 
     def setup_ffmpeg(self):
-        """Setup FFmpeg path for pydub"""
-        try:
-            # Try to find ffmpeg in system PATH
-            if sys.platform == "win32":
-                # Windows - common installation paths
-                possible_paths = [
-                    "ffmpeg",
-                    "ffmpeg.exe",
-                    r"C:\ffmpeg\bin\ffmpeg.exe",
-                    r"C:\Program Files\ffmpeg\bin\ffmpeg.exe"
-                ]
-            else:
-                # Linux/Mac
-                possible_paths = ["ffmpeg", "/usr/bin/ffmpeg", "/usr/local/bin/ffmpeg"]
-
-            for path in possible_paths:
-                try:
-                    subprocess.run([path, "-version"], capture_output=True, check=True)
-                    AudioSegment.converter = path
-                    st.sidebar.success("✅ FFmpeg found!")
-                    return
-                except:
-                    continue
-
+        """Setup FFmpeg path for audio decoding"""
+        path = _find_ffmpeg()
+        if path:
+            self.ffmpeg_path = path
+            st.sidebar.success("✅ FFmpeg found!")
+        else:
             st.sidebar.warning("⚠️ FFmpeg not found. Audio processing may not work properly.")
 
-        except Exception as e:
-            st.sidebar.warning(f"⚠️ FFmpeg setup issue: {e}")
-
     def init_session_state(self):
         """Initialize all session state variables"""
         # Project Management
@@ -59,14 +446,20 @@ class AIPreProductionStudio:
             st.session_state.projects = {}
         if 'team_members' not in st.session_state:
             st.session_state.team_members = []
+        if 'team_members_set' not in st.session_state:
+            st.session_state.team_members_set = set(st.session_state.team_members)
         if 'tasks' not in st.session_state:
-            st.session_state.tasks = []
+            st.session_state.tasks = {}
+        if 'tasks_editor_version' not in st.session_state:
+            st.session_state.tasks_editor_version = 0
         if 'comments' not in st.session_state:
-            st.session_state.comments = {}
+            st.session_state.comments = defaultdict(dict)
+        if 'open_comment_section' not in st.session_state:
+            st.session_state.open_comment_section = None
 
         # Research & Transcripts
         if 'research_materials' not in st.session_state:
-            st.session_state.research_materials = []
+            st.session_state.research_materials = {}
         if 'transcripts' not in st.session_state:
             st.session_state.transcripts = []
         if 'current_transcript' not in st.session_state:
@@ -75,6 +468,8 @@ class AIPreProductionStudio:
         # Scripts
         if 'script_content' not in st.session_state:
             st.session_state.script_content = ""
+        if 'script_stats' not in st.session_state:
+            st.session_state.script_stats = self.compute_script_stats(st.session_state.script_content)
         if 'ai_suggestions' not in st.session_state:
             st.session_state.ai_suggestions = []
         if 'current_genre' not in st.session_state:
@@ -84,7 +479,13 @@ class AIPreProductionStudio:
 
         # Storyboards
         if 'storyboard_scenes' not in st.session_state:
-            st.session_state.storyboard_scenes = []
+            st.session_state.storyboard_scenes = {}
+        if 'scene_order' not in st.session_state:
+            st.session_state.scene_order = []
+        if 'scene_id_index' not in st.session_state:
+            st.session_state.scene_id_index = {}
+        if 'scene_id_counter' not in st.session_state:
+            st.session_state.scene_id_counter = 0
         if 'current_storyboard' not in st.session_state:
             st.session_state.current_storyboard = None
 
@@ -92,6 +493,23 @@ class AIPreProductionStudio:
         if 'collaboration_mode' not in st.session_state:
             st.session_state.collaboration_mode = False
 
+        # Autosave
+        if 'autosave_dirty' not in st.session_state:
+            st.session_state.autosave_dirty = False
+        if 'autosave_writer' not in st.session_state:
+            st.session_state.autosave_writer = _AutosaveWriter()
+
+    @staticmethod
+    def compute_script_stats(script_text: str) -> Dict:
+        """Word and line counts for a script"""
+        return {"words": len(script_text.split()), "lines": script_text.count('\n') + 1}
+
+    def set_script_content(self, script_text: str):
+        """Replace the script and refresh its cached statistics"""
+        st.session_state.script_content = script_text
+        st.session_state.script_stats = self.compute_script_stats(script_text)
+        self.mark_dirty()
+
     def run(self):
         """Main application runner"""
         st.set_page_config(
@@ -102,38 +520,7 @@ class AIPreProductionStudio:
         )
 
         # Custom CSS
-        st.markdown("""
-        <style>
-        .main-header {
-            font-size: 3rem;
-            color: #1f77b4;
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-        .creative-card {
-            padding: 1.5rem;
-            border-radius: 10px;
-            background-color: #f8f9fa;
-            border-left: 5px solid #4CAF50;
-            margin: 10px 0;
-        }
-        .scene-card {
-            padding: 1rem;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            margin: 5px 0;
-            background: white;
-            cursor: move;
-        }
-        .task-item {
-            padding: 0.5rem;
-            margin: 0.2rem 0;
-            background: #f0f8ff;
-            border-radius: 5px;
-            border-left: 4px solid #007bff;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(_CSS, unsafe_allow_html=True)
 
         st.markdown('<h1 class="main-header">🎬 AI Pre-Production Studio</h1>', unsafe_allow_html=True)
 
@@ -160,6 +547,74 @@ class AIPreProductionStudio:
         with tab5:
             self.render_collaboration_tab()
 
+        self.autosave_project()
+
+    def mark_dirty(self):
+        """Flag project state as changed so the next autosave writes it"""
+        st.session_state.autosave_dirty = True
+
+    def autosave_project(self):
+        """Persist dirty project state with orjson, at most once per interval with a trailing write"""
+        writer = st.session_state.autosave_writer
+        if st.session_state.autosave_dirty:
+            st.session_state.autosave_dirty = False
+            # Container copies only; serialization waits until the writer actually writes, and the
+            # copies keep a trailing write from iterating a dict this thread is resizing
+            state = {key: copy.copy(st.session_state[key]) for key in _AUTOSAVE_KEYS}
+            state["comments"] = {section: dict(comments) for section, comments in state["comments"].items()}
+            writer.submit(_autosave_path(st.session_state.current_project), state)
+        if writer.error:
+            st.toast(f"⚠️ Autosave failed: {writer.error}")
+            writer.error = None
+
+    def list_saved_projects(self) -> List[str]:
+        """Names of autosaved projects on disk"""
+        try:
+            names = os.listdir(_AUTOSAVE_DIR)
+        except OSError:
+            return []
+        return sorted(name[:-len(".json")] for name in names if name.endswith(".json"))
+
+    def load_project(self, name: str):
+        """Replace the session's project with an autosaved one; used as an on_click callback"""
+        writer = st.session_state.autosave_writer
+        # Save pending changes to the current project before switching away from it
+        self.autosave_project()
+        writer.flush()
+        try:
+            with open(os.path.join(_AUTOSAVE_DIR, f"{name}.json"), "rb") as f:
+                saved = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            st.toast(f"⚠️ Could not open project: {e}")
+            return
+
+        # Drop widget state for the outgoing scenes and script so widgets pick up the loaded values
+        for scene in st.session_state.storyboard_scenes.values():
+            for key in scene.keys.values():
+                st.session_state.pop(key, None)
+        st.session_state.pop("script_editor", None)
+
+        scenes = [Scene(**scene) for scene in saved["storyboard_scenes"].values()]
+        st.session_state.storyboard_scenes = {scene.id: scene for scene in scenes}
+        st.session_state.scene_order = saved["scene_order"]
+        st.session_state.scene_id_counter = max((scene.id for scene in scenes), default=0)
+        self.reindex_scenes()
+
+        st.session_state.tasks = {task_id: Task(**task) for task_id, task in saved["tasks"].items()}
+        st.session_state.tasks_editor_version += 1
+        st.session_state.comments = defaultdict(dict, {
+            section: {comment_id: Comment(**comment) for comment_id, comment in section_comments.items()}
+            for section, section_comments in saved["comments"].items()
+        })
+        st.session_state.team_members = saved["team_members"]
+        st.session_state.team_members_set = set(saved["team_members"])
+
+        for key in ("current_project", "current_genre", "script_versions", "research_materials", "transcripts"):
+            st.session_state[key] = saved[key]
+        st.session_state.script_content = saved["script_content"]
+        st.session_state.script_stats = self.compute_script_stats(saved["script_content"])
+        st.session_state.autosave_dirty = False
+
     def render_sidebar(self):
         """Sidebar for project management"""
         with st.sidebar:
@@ -167,10 +622,20 @@ class AIPreProductionStudio:
 
             # Project selection
             st.subheader("Current Project")
-            st.session_state.current_project = st.text_input(
+            project_name = st.text_input(
                 "Project Name",
                 st.session_state.current_project
             )
+            if project_name != st.session_state.current_project:
+                # One file per project: the old name's file moves with the rename
+                st.session_state.autosave_writer.discard(_autosave_path(st.session_state.current_project))
+                st.session_state.current_project = project_name
+                self.mark_dirty()
+
+            saved_projects = self.list_saved_projects()
+            if saved_projects:
+                saved_project = st.selectbox("Saved Projects", saved_projects)
+                st.button("📂 Open Project", on_click=self.load_project, args=(saved_project,))
 
             # Genre templates (Bonus Feature)
             st.subheader("🎭 Genre Templates")
@@ -185,16 +650,18 @@ class AIPreProductionStudio:
             selected_genre = st.selectbox(
                 "Choose Template",
                 options=list(genre_templates.keys()),
-                index=0
+                index=list(genre_templates).index(st.session_state.current_genre)
             )
-            st.session_state.current_genre = selected_genre
+            if selected_genre != st.session_state.current_genre:
+                st.session_state.current_genre = selected_genre
+                self.mark_dirty()
             st.info(f"📝 {genre_templates[selected_genre]}")
 
             # Quick stats
             st.subheader("📊 Quick Stats")
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Words", len(st.session_state.script_content.split()))
+                st.metric("Words", st.session_state.script_stats["words"])
             with col2:
                 st.metric("Scenes", len(st.session_state.storyboard_scenes))
 
@@ -216,7 +683,7 @@ class AIPreProductionStudio:
         with col1:
             st.metric("Project", st.session_state.current_project)
         with col2:
-            st.metric("Script Progress", f"{len(st.session_state.script_content.split())} words")
+            st.metric("Script Progress", f"{st.session_state.script_stats['words']} words")
         with col3:
             st.metric("Research Items", len(st.session_state.research_materials))
         with col4:
@@ -230,16 +697,17 @@ class AIPreProductionStudio:
             st.write("**Latest Script Changes**")
             if st.session_state.script_versions:
                 latest = st.session_state.script_versions[-1]
-                st.write(f"🕒 {latest['timestamp']}: {latest['changes']} words modified")
+                changed_at = _format_epoch(latest['timestamp'], _FMT_TIME)
+                st.write(f"🕒 {changed_at}: {latest['changes']} words modified")
             else:
                 st.write("No recent changes")
 
         with activity_col2:
             st.write("**Team Activity**")
             if st.session_state.tasks:
-                for task in st.session_state.tasks[-3:]:
-                    status = "✅" if task['completed'] else "⏳"
-                    st.write(f"{status} {task['assignee']}: {task['description']}")
+                for task in list(islice(reversed(st.session_state.tasks.values()), 3))[::-1]:
+                    status = "✅" if task.completed else "⏳"
+                    st.write(f"{status} {task.assignee}: {task.description}")
             else:
                 st.write("No team activity")
 
@@ -291,29 +759,34 @@ class AIPreProductionStudio:
                         "title": title,
                         "content": content,
                         "tags": [tag.strip() for tag in tags.split(",")] if tags else [],
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        "timestamp": time.time()
                     }
-                    st.session_state.research_materials.append(research_item)
+                    st.session_state.setdefault("research_materials", {})[research_item['id']] = research_item
+                    self.mark_dirty()
                     st.success("Research material added!")
 
         # Display research materials
         st.subheader("Research Library")
-        for research in st.session_state.research_materials:
+        for research in st.session_state.research_materials.values():
             with st.expander(f"{research['type']} - {research['title']}"):
                 st.write(f"**Content:** {research['content']}")
                 st.write(f"**Tags:** {', '.join(research['tags'])}")
-                st.write(f"**Added:** {research['timestamp']}")
+                st.write(f"**Added:** {_format_epoch(research['timestamp'], _FMT_DATETIME)}")
 
                 col1, col2 = st.columns(2)
                 with col1:
                     if st.button("Use in Script", key=f"use_{research['id']}"):
-                        st.session_state.script_content += f"\n\n[Research: {research['title']}]\n{research['content']}"
+                        self.set_script_content(
+                            st.session_state.script_content + f"\n\n[Research: {research['title']}]\n{research['content']}")
                         st.success("Added to script!")
                 with col2:
-                    if st.button("Delete", key=f"del_{research['id']}"):
-                        st.session_state.research_materials = [r for r in st.session_state.research_materials if
-                                                               r['id'] != research['id']]
-                        st.rerun()
+                    st.button("Delete", key=f"del_{research['id']}",
+                              on_click=self.delete_research, args=(research['id'],))
+
+    def delete_research(self, research_id: str):
+        """Remove a research item"""
+        st.session_state.research_materials.pop(research_id, None)
+        self.mark_dirty()
 
     def render_transcription_section(self):
         """AI Transcription with timestamps"""
@@ -323,281 +796,275 @@ class AIPreProductionStudio:
 
         with col1:
             st.write("**YouTube Transcription**")
-            youtube_url = st.text_input("YouTube URL:", placeholder="https://www.youtube.com/watch?v=...",
+            youtube_urls = st.text_area("YouTube URLs (one per line):",
+                                        placeholder="https://www.youtube.com/watch?v=...",
                                         key="youtube_url")
 
             if st.button("🎬 Transcribe YouTube", use_container_width=True):
-                if youtube_url:
-                    with st.spinner("Downloading and transcribing..."):
-                        transcript_data = self.transcribe_youtube_with_timestamps(youtube_url)
-                        if transcript_data:
-                            st.session_state.transcripts.append(transcript_data)
-                            st.session_state.current_transcript = transcript_data
-                            st.success("✅ Transcription Complete!")
+                urls = [url.strip() for url in youtube_urls.splitlines() if url.strip()]
+                if urls:
+                    with st.spinner(f"Downloading and transcribing {len(urls)} video(s)..."):
+                        results = self.transcribe_youtube_batch(urls)
+                        completed = [transcript_data for transcript_data in results if transcript_data]
+                        if completed:
+                            st.session_state.transcripts.extend(completed)
+                            self.mark_dirty()
+                            st.session_state.current_transcript = completed[-1]
+                            st.success(f"✅ Transcription Complete! ({len(completed)}/{len(results)} videos)")
                         else:
                             st.error("❌ Failed to transcribe YouTube video")
 
         with col2:
             st.write("**Video/Audio File Transcription**")
-            uploaded_file = st.file_uploader("Upload video or audio file",
-                                             type=["mp4", "mov", "avi", "mp3", "wav", "m4a"],
-                                             key="audio_upload")
-
-            if uploaded_file is not None and st.button("🎤 Transcribe File", use_container_width=True):
-                with st.spinner("Transcribing file..."):
-                    transcript_data = self.transcribe_video_file(uploaded_file)
-                    if transcript_data:
-                        st.session_state.transcripts.append(transcript_data)
-                        st.session_state.current_transcript = transcript_data
-                        st.success("✅ Transcription Complete!")
+            uploaded_files = st.file_uploader("Upload video or audio files",
+                                              type=["mp4", "mov", "avi", "mp3", "wav", "m4a"],
+                                              accept_multiple_files=True,
+                                              key="audio_upload")
+
+            if uploaded_files and st.button("🎤 Transcribe Files", use_container_width=True):
+                with st.spinner(f"Transcribing {len(uploaded_files)} file(s)..."):
+                    results = self.transcribe_files_batch(uploaded_files)
+                    completed = [transcript_data for transcript_data in results if transcript_data]
+                    if completed:
+                        st.session_state.transcripts.extend(completed)
+                        self.mark_dirty()
+                        st.session_state.current_transcript = completed[-1]
+                        st.success(f"✅ Transcription Complete! ({len(completed)}/{len(results)} files)")
                     else:
-                        st.error("❌ Failed to transcribe file")
+                        st.error("❌ Failed to transcribe files")
 
         # Display current transcript with timestamps
         if st.session_state.current_transcript:
             self.display_transcript_with_timestamps(st.session_state.current_transcript)
 
-    def transcribe_video_file(self, video_file):
-        """Transcribe uploaded video/audio files using SpeechRecognition"""
-        if video_file is None:
-            return None
+    def run_concurrently(self, func, items: List) -> List:
+        """Map func(item, status) over items on a small thread pool, rendering status on the script thread"""
+        if len(items) == 1:
+            return [func(items[0], _StatusLog())]
 
-        video_path = None
-        audio_path = None
+        # Workers only buffer their status; Streamlit elements are emitted here, one item at a time
+        def run_buffered(item):
+            status = _StatusLog(buffered=True)
+            return func(item, status), status
 
-        try:
-            # 1. Save uploaded file to a temporary file
-            file_extension = video_file.name.split('.')[-1].lower()
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as tmp_video:
-                tmp_video.write(video_file.read())
-                video_path = tmp_video.name
-
-            # 2. Extract audio using pydub
-            st.info("Extracting audio from file...")
-
-            # Handle different file types
-            if file_extension in ['mp3', 'wav', 'm4a']:
-                # Direct audio file
-                audio = AudioSegment.from_file(video_path)
-            else:
-                # Video file - extract audio
-                audio = AudioSegment.from_file(video_path)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            outcomes = list(executor.map(run_buffered, items))
+        for _, status in outcomes:
+            status.replay()
+        return [result for result, _ in outcomes]
 
-            # 3. Save audio to a temporary WAV file for SpeechRecognition
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_audio:
-                audio_path = tmp_audio.name
-                audio.export(audio_path, format="wav")
+    def transcribe_files_batch(self, files: List) -> List[Dict]:
+        """Transcribe several uploaded files concurrently, overlapping ffmpeg decoding with inference"""
+        return self.run_concurrently(self.transcribe_video_file, files)
 
-            # 4. Transcribe the audio
-            st.info("Transcribing audio to text...")
-            r = sr.Recognizer()
+    def transcribe_youtube_batch(self, video_urls: List[str]) -> List[Dict]:
+        """Transcribe several YouTube videos concurrently, overlapping downloads with inference"""
+        return self.run_concurrently(self.transcribe_youtube, video_urls)
 
-            with sr.AudioFile(audio_path) as source:
-                # Adjust for ambient noise and record
-                r.adjust_for_ambient_noise(source, duration=0.5)
-                audio_data = r.record(source)
+    def transcribe_video_file(self, video_file, status: _StatusLog):
+        """Transcribe an uploaded video/audio file, reusing any cached transcript of the same content"""
+        if video_file is None:
+            return None
+
+        file_bytes = video_file.getvalue()
+        cache_path = _transcript_cache_path(file_bytes, video_file.name)
+        transcript_data = _load_cached_transcript(cache_path)
+        if transcript_data is None:
+            transcript_data = self.transcribe_media_bytes(file_bytes, video_file.name, status)
+            if transcript_data is not None:
+                _store_cached_transcript(cache_path, transcript_data)
+        return transcript_data
+
+    def transcribe_media_bytes(self, file_bytes: bytes, name: str, status: _StatusLog):
+        """Transcribe video/audio file contents with batched Whisper inference"""
+        try:
+            # 1. Decode the upload straight to 16kHz mono float32 PCM
+            status.info("Extracting audio from file...")
+            audio = _decode_audio(file_bytes, self.ffmpeg_path)
 
-                # Using Google's STT (requires internet)
-                text = r.recognize_google(audio_data)
+            # 2. Transcribe the audio in VAD-segmented batches
+            status.info("Transcribing audio to text...")
+            segments = _transcribe_audio(audio)
 
             # Create transcript data structure
             transcript_data = {
                 "id": str(uuid.uuid4()),
-                "source": video_file.name,
-                "title": video_file.name,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "segments": [{
-                    "start": 0,
-                    "end": len(audio) / 1000,  # Convert to seconds
-                    "text": text,
-                    "words": []
-                }]
+                "source": name,
+                "title": name,
+                "timestamp": datetime.now().strftime(_FMT_DATETIME),
+                "segments": status.collect_segments(segments)
             }
 
+            if not transcript_data['segments']:
+                status.error("❌ Could not understand the audio")
+                return None
+
             return transcript_data
 
-        except sr.UnknownValueError:
-            st.error("❌ Could not understand the audio")
-            return None
-        except sr.RequestError as e:
-            st.error(f"❌ Error with speech recognition service: {e}")
+        except subprocess.CalledProcessError as e:
+            status.error(f"❌ Could not decode audio: {e.stderr.decode(errors='replace').strip()}")
             return None
         except Exception as e:
-            st.error(f"❌ An error occurred during transcription: {str(e)}")
+            status.error(f"❌ An error occurred during transcription: {str(e)}")
             return None
 
-        finally:
-            # Clean up temporary files
+    def download_youtube_audio(self, video_url: str, audio_format: str = 'bestaudio/best',
+                               player_client: str = None) -> np.ndarray:
+        """Stream YouTube audio from yt-dlp through ffmpeg into memory, without touching disk"""
+        import yt_dlp
+
+        command = [sys.executable, "-m", "yt_dlp", "--quiet", "--no-warnings", "--no-playlist",
+                   "-f", audio_format, "-o", "-"]
+        if player_client:
+            command += ["--extractor-args", f"youtube:player_client={player_client}"]
+        # stderr goes to a temp file: a pipe nobody drains until stdout ends could fill and stall yt-dlp
+        with tempfile.TemporaryFile() as stderr:
+            downloader = subprocess.Popen(command + [video_url], stdout=subprocess.PIPE, stderr=stderr)
             try:
-                if video_path and os.path.exists(video_path):
-                    os.remove(video_path)
-                if audio_path and os.path.exists(audio_path):
-                    os.remove(audio_path)
-            except Exception as e:
-                st.warning(f"⚠️ Could not clean up temporary files: {e}")
-
-    def transcribe_youtube_with_timestamps(self, video_url: str) -> Dict:
+                audio = _decode_audio(downloader.stdout, self.ffmpeg_path)
+            finally:
+                downloader.stdout.close()
+                if downloader.wait() != 0:
+                    stderr.seek(0)
+                    error = stderr.read().decode(errors="replace").strip()
+                    raise yt_dlp.DownloadError(error or "yt-dlp exited with an error")
+        return audio
+
+    def transcribe_youtube(self, video_url: str, status: _StatusLog) -> Dict:
+        """Transcribe a YouTube video, reusing any cached transcript of the same URL"""
+        cache_path = _transcript_cache_path(video_url)
+        transcript_data = _load_cached_transcript(cache_path)
+        if transcript_data is None:
+            transcript_data = self.transcribe_youtube_with_timestamps(video_url, status)
+            if transcript_data is not None:
+                _store_cached_transcript(cache_path, transcript_data)
+        return transcript_data
+
+    def transcribe_youtube_with_timestamps(self, video_url: str, status: _StatusLog) -> Dict:
         """Transcribe YouTube video with timestamps using yt-dlp"""
-        temp_dir = None
+        import yt_dlp
+
         try:
-            st.info("📥 Downloading YouTube video...")
-
-            # Create a temporary directory for downloads
-            temp_dir = tempfile.mkdtemp()
-
-            # Use yt-dlp with better options
-            ydl_opts = {
-                'format': 'bestaudio/best',
-                'outtmpl': os.path.join(temp_dir, '%(title)s.%(ext)s'),
-                'quiet': False,
-                'no_warnings': False,
-                'extractaudio': True,
-                'audioformat': 'mp3',
-                'noplaylist': True,
-            }
+            status.info("📥 Downloading YouTube video...")
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with yt_dlp.YoutubeDL({'quiet': True, 'noplaylist': True}) as ydl:
                 # Extract info first
                 info = ydl.extract_info(video_url, download=False)
                 video_title = info.get('title', 'Unknown')
 
-                # Now download
-                st.info(f"Downloading: {video_title}")
-                ydl.download([video_url])
-
-                # Find the downloaded file
-                downloaded_files = [f for f in os.listdir(temp_dir) if f.endswith(('.mp3', '.m4a', '.webm'))]
+            # Now download straight into memory
+            status.info(f"Downloading: {video_title}")
+            audio = self.download_youtube_audio(video_url)
 
-                if not downloaded_files:
-                    st.error("❌ No audio file found after download")
-                    return None
-
-                audio_file_path = os.path.join(temp_dir, downloaded_files[0])
-
-                if not os.path.exists(audio_file_path):
-                    st.error(f"❌ Downloaded file not found: {audio_file_path}")
-                    return None
+            if audio.size == 0:
+                status.error("❌ No audio found after download")
+                return None
 
-                st.info(f"✅ Download complete: {os.path.getsize(audio_file_path)} bytes")
+            status.info(f"✅ Download complete: {audio.size / 16000:.1f}s of audio")
 
             # Transcribe with whisper
-            st.info("🔊 Transcribing audio...")
-            model = whisper.load_model("base")
-            result = model.transcribe(audio_file_path, word_timestamps=True)
+            status.info("🔊 Transcribing audio...")
+            segments = _transcribe_audio(audio)
 
             # Process with timestamps
             transcript_data = {
                 "id": str(uuid.uuid4()),
                 "source": video_url,
                 "title": video_title,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "segments": []
+                "timestamp": datetime.now().strftime(_FMT_DATETIME),
+                "segments": status.collect_segments(segments)
             }
 
-            for segment in result['segments']:
-                transcript_data['segments'].append({
-                    "start": segment['start'],
-                    "end": segment['end'],
-                    "text": segment['text'],
-                    "words": segment.get('words', [])
-                })
-
-            st.success(f"✅ Transcription complete: {len(transcript_data['segments'])} segments")
+            status.success(f"✅ Transcription complete: {len(transcript_data['segments'])} segments")
             return transcript_data
 
         except yt_dlp.DownloadError as e:
-            st.error(f"❌ YouTube download error: {str(e)}")
+            status.error(f"❌ YouTube download error: {str(e)}")
             # Try alternative approach
-            return self.transcribe_youtube_alternative(video_url)
+            return self.transcribe_youtube_alternative(video_url, status)
         except Exception as e:
-            st.error(f"❌ Transcription error: {str(e)}")
+            status.error(f"❌ Transcription error: {str(e)}")
             import traceback
-            st.error(f"Detailed error: {traceback.format_exc()}")
+            status.error(f"Detailed error: {traceback.format_exc()}")
             return None
-        finally:
-            # Clean up temporary directory
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    import shutil
-                    shutil.rmtree(temp_dir)
-                except:
-                    pass
 
-    def transcribe_youtube_alternative(self, video_url: str) -> Dict:
-        """Alternative YouTube transcription method using direct download"""
-        try:
-            st.info("🔄 Trying alternative download method...")
-
-            # Use pytube as fallback
-            yt = YouTube(video_url)
-            audio_stream = yt.streams.filter(only_audio=True).first()
-
-            if not audio_stream:
-                st.error("❌ No audio stream found")
-                return None
+    def transcribe_youtube_alternative(self, video_url: str, status: _StatusLog) -> Dict:
+        """Alternative YouTube transcription method retrying yt-dlp with other formats and player clients"""
+        import yt_dlp
 
-            # Download to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-                temp_path = tmp_file.name
-
-            st.info(f"Downloading: {yt.title}")
-            audio_stream.download(filename=temp_path)
+        try:
+            status.info("🔄 Trying alternative download method...")
+
+            # Retry with a lighter format selection, cycling through alternate YouTube player clients
+            last_error = None
+            for player_client in _FALLBACK_PLAYER_CLIENTS:
+                ydl_opts = {
+                    'quiet': True,
+                    'noplaylist': True,
+                    'extractor_args': {'youtube': {'player_client': [player_client]}},
+                }
+                try:
+                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                        info = ydl.extract_info(video_url, download=False)
+                        video_title = info.get('title', 'video')
+                    audio = self.download_youtube_audio(video_url, audio_format='bestaudio/worst',
+                                                        player_client=player_client)
+                    break
+                except yt_dlp.DownloadError as e:
+                    last_error = e
+            else:
+                raise last_error
 
-            if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
-                st.error("❌ Download failed - file is empty or doesn't exist")
+            if audio.size == 0:
+                status.error("❌ Download failed - no audio received")
                 return None
 
-            st.info("🔊 Transcribing with Whisper...")
-            model = whisper.load_model("base")
-            result = model.transcribe(temp_path, word_timestamps=True)
+            status.info("🔊 Transcribing with Whisper...")
+            segments = _transcribe_audio(audio)
 
             # Process with timestamps
             transcript_data = {
                 "id": str(uuid.uuid4()),
                 "source": video_url,
-                "title": yt.title,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "segments": []
+                "title": video_title,
+                "timestamp": datetime.now().strftime(_FMT_DATETIME),
+                "segments": status.collect_segments(segments)
             }
 
-            for segment in result['segments']:
-                transcript_data['segments'].append({
-                    "start": segment['start'],
-                    "end": segment['end'],
-                    "text": segment['text'],
-                    "words": segment.get('words', [])
-                })
-
-            os.unlink(temp_path)
-            st.success("✅ Alternative method succeeded!")
+            status.success("✅ Alternative method succeeded!")
             return transcript_data
 
         except Exception as e:
-            st.error(f"❌ Alternative method also failed: {str(e)}")
+            status.error(f"❌ Alternative method also failed: {str(e)}")
             return None
 
+    @st.fragment
     def display_transcript_with_timestamps(self, transcript_data: Dict):
         """Display transcript with timestamped segments"""
         st.subheader(f"📝 Transcript: {transcript_data['title']}")
 
-        for segment in transcript_data['segments']:
-            minutes = int(segment['start'] // 60)
-            seconds = int(segment['start'] % 60)
-            timestamp = f"{minutes:02d}:{seconds:02d}"
+        segments = transcript_data['segments']
+        st.dataframe(_transcript_columns(transcript_data['id'], segments), use_container_width=True, hide_index=True)
 
-            col1, col2 = st.columns([1, 4])
-            with col1:
-                st.write(f"`{timestamp}`")
-            with col2:
-                st.write(segment['text'])
-
-                # Add to script button for each segment
-                if st.button("Add to Script", key=f"add_{segment['start']}_{uuid.uuid4()}"):
-                    st.session_state.script_content += f"\n\n[TIMESTAMP: {timestamp}]\n{segment['text']}"
-                    st.success("Added to script!")
+        # Add selected segments to the script in one form submission
+        with st.form(f"add_segments_{transcript_data['id']}"):
+            choices = st.multiselect(
+                "Segments to add",
+                range(len(segments)),
+                format_func=lambda i: f"{_format_timestamp(segments[i]['start'])} {segments[i]['text'][:40]}"
+            )
+            if st.form_submit_button("Add to Script") and choices:
+                additions = "".join(
+                    f"\n\n[TIMESTAMP: {_format_timestamp(segments[i]['start'])}]\n{segments[i]['text']}"
+                    for i in sorted(choices)
+                )
+                self.set_script_content(st.session_state.script_content + additions)
+                st.toast(f"Added {len(choices)} segment(s) to script!")
+                # The editor and word counts live outside this fragment, so redraw the whole app
+                st.rerun()
 
         # Download transcript button
-        transcript_text = "\n".join([f"[{seg['start']:.2f}s] {seg['text']}" for seg in transcript_data['segments']])
+        transcript_text = _serialize_transcript(transcript_data['id'], segments)
         st.download_button(
             label="📥 Download Transcript",
             data=transcript_text,
@@ -605,6 +1072,8 @@ class AIPreProductionStudio:
             mime="text/plain"
         )
 
+        self.autosave_project()
+
     # ... (rest of your existing methods remain the same)
     def render_script_tab(self):
         """Smart Script Editor with AI-driven suggestions"""
@@ -623,8 +1092,8 @@ class AIPreProductionStudio:
         st.write(f"**Genre:** {st.session_state.current_genre}")
 
         # Real-time statistics
-        words = len(st.session_state.script_content.split())
-        lines = st.session_state.script_content.count('\n') + 1
+        words = st.session_state.script_stats["words"]
+        lines = st.session_state.script_stats["lines"]
         pages = max(1, words // 250)
 
         col1, col2, col3 = st.columns(3)
@@ -647,21 +1116,20 @@ class AIPreProductionStudio:
 
         # Track changes and generate AI suggestions
         if updated_script != st.session_state.script_content:
-            old_content = st.session_state.script_content
-            st.session_state.script_content = updated_script
+            old_words = st.session_state.script_stats["words"]
+            self.set_script_content(updated_script)
 
             # Save version
-            change_count = abs(len(updated_script.split()) - len(old_content.split()))
+            change_count = abs(st.session_state.script_stats["words"] - old_words)
             if change_count > 0:
                 st.session_state.script_versions.append({
-                    "timestamp": datetime.now().strftime("%H:%M:%S"),
+                    "timestamp": time.time(),
                     "changes": change_count
                 })
 
-            # Generate AI suggestions
+            # Generate AI suggestions; the analysis is memoized on the text, so refreshing is cheap
             if updated_script.strip():
                 with st.spinner("🤖 AI is analyzing your script..."):
-                    time.sleep(1)
                     ai_suggestions = self.generate_ai_suggestions(updated_script)
                     st.session_state.ai_suggestions = ai_suggestions
 
@@ -682,6 +1150,7 @@ class AIPreProductionStudio:
             if st.button("🔄 Analyze", use_container_width=True):
                 self.generate_comprehensive_analysis()
 
+    @st.fragment
     def render_ai_assistant_panel(self):
         """AI-driven suggestions panel"""
         st.header("🤖 AI Script Assistant")
@@ -697,7 +1166,6 @@ class AIPreProductionStudio:
             if st.button(label, key=f"suggest_{category}", use_container_width=True):
                 if st.session_state.script_content.strip():
                     with st.spinner(f"Generating {category} suggestions..."):
-                        time.sleep(1)
                         suggestions = self.generate_category_suggestions(category)
                         st.session_state.ai_suggestions.extend(suggestions)
                         st.success(f"Generated {len(suggestions)} suggestions!")
@@ -707,7 +1175,8 @@ class AIPreProductionStudio:
         # Display current suggestions
         if st.session_state.ai_suggestions:
             st.subheader("💡 AI Suggestions")
-            for i, suggestion in enumerate(st.session_state.ai_suggestions[-5:]):
+            first = max(0, len(st.session_state.ai_suggestions) - 5)
+            for i, suggestion in enumerate(st.session_state.ai_suggestions[first:], first):
                 with st.container():
                     st.markdown(f"""
                     <div class="creative-card">
@@ -722,55 +1191,17 @@ class AIPreProductionStudio:
                         if st.button("Apply", key=f"apply_{i}"):
                             st.success("Suggestion applied!")
                     with col2:
-                        if st.button("Dismiss", key=f"dismiss_{i}"):
-                            st.session_state.ai_suggestions.pop(i)
-                            st.rerun()
+                        st.button("Dismiss", key=f"dismiss_{i}",
+                                  on_click=self.dismiss_suggestion, args=(i,))
+
+    def dismiss_suggestion(self, index: int):
+        """Remove a suggestion by its position in the full suggestion list"""
+        if index < len(st.session_state.ai_suggestions):
+            st.session_state.ai_suggestions.pop(index)
 
     def generate_ai_suggestions(self, script_text: str) -> List[Dict]:
         """Generate AI suggestions based on script content"""
-        if len(script_text.strip()) < 50:
-            return [{
-                "type": "📝 Getting Started",
-                "text": "Start writing your screenplay! I'll provide specific suggestions as you develop your story.",
-                "confidence": 95
-            }]
-
-        suggestions = []
-
-        # Analyze content
-        lines = script_text.split('\n')
-        words = script_text.split()
-        word_count = len(words)
-
-        # Dialogue analysis
-        dialogue_lines = [line for line in lines if ':' in line]
-        if not dialogue_lines and word_count > 100:
-            suggestions.append({
-                "type": "💬 Dialogue Opportunity",
-                "text": "Consider adding character dialogue to reveal relationships and advance the plot.",
-                "confidence": 88
-            })
-
-        # Structure analysis
-        scene_headings = [line for line in lines if line.strip().startswith(('INT.', 'EXT.'))]
-        if not scene_headings:
-            suggestions.append({
-                "type": "🏗️ Structure",
-                "text": "Add scene headings: 'INT. LOCATION - TIME' for professional formatting.",
-                "confidence": 92
-            })
-
-        # Character analysis
-        if dialogue_lines:
-            characters = set(line.split(':')[0].strip() for line in dialogue_lines)
-            if len(characters) == 1:
-                suggestions.append({
-                    "type": "👤 Character Development",
-                    "text": f"Add more characters to create dialogue exchanges and conflict.",
-                    "confidence": 85
-                })
-
-        return suggestions[:3]
+        return _ai_suggestions(script_text)
 
     def generate_category_suggestions(self, category: str) -> List[Dict]:
         """Generate category-specific suggestions"""
@@ -804,6 +1235,7 @@ class AIPreProductionStudio:
         with col2:
             self.render_storyboard_controls()
 
+    @st.fragment
     def render_storyboard_visualization(self):
         """Visual storyboard with drag-and-drop scenes"""
         st.subheader("📋 Narrative Flow")
@@ -811,61 +1243,52 @@ class AIPreProductionStudio:
         # Initialize scenes if empty
         if not st.session_state.storyboard_scenes:
             default_scenes = [
-                {"id": 1, "title": "Opening", "description": "Establish setting and main character", "notes": "",
-                 "order": 1},
-                {"id": 2, "title": "Inciting Incident", "description": "Event that starts the story", "notes": "",
-                 "order": 2},
-                {"id": 3, "title": "Climax", "description": "Highest point of tension", "notes": "", "order": 3},
-                {"id": 4, "title": "Resolution", "description": "Story conclusion", "notes": "", "order": 4}
+                Scene(self.next_scene_id(), "Opening", "Establish setting and main character", ""),
+                Scene(self.next_scene_id(), "Inciting Incident", "Event that starts the story", ""),
+                Scene(self.next_scene_id(), "Climax", "Highest point of tension", ""),
+                Scene(self.next_scene_id(), "Resolution", "Story conclusion", "")
             ]
-            st.session_state.storyboard_scenes = default_scenes
+            st.session_state.storyboard_scenes = {scene.id: scene for scene in default_scenes}
+            st.session_state.scene_order = [scene.id for scene in default_scenes]
+            self.reindex_scenes()
 
         # Display scenes in order
-        for scene in sorted(st.session_state.storyboard_scenes, key=lambda x: x['order']):
-            with st.expander(f"🎬 {scene['title']} (Scene {scene['order']})", expanded=True):
+        scenes = st.session_state.storyboard_scenes
+        for position, scene_id in enumerate(st.session_state.scene_order, 1):
+            scene = scenes[scene_id]
+            keys = scene.keys
+            with st.expander(f"🎬 {scene.title} (Scene {position})", expanded=True):
                 col1, col2 = st.columns([3, 1])
 
                 with col1:
-                    new_desc = st.text_area(
+                    st.text_area(
                         "Description",
-                        value=scene['description'],
-                        key=f"desc_{scene['id']}",
-                        height=80
+                        value=scene.description,
+                        key=keys["desc"],
+                        height=80,
+                        on_change=self.update_scene_field,
+                        args=(scene.id, "description", keys["desc"])
                     )
-                    new_notes = st.text_area(
+                    st.text_area(
                         "Notes",
-                        value=scene['notes'],
-                        key=f"notes_{scene['id']}",
+                        value=scene.notes,
+                        key=keys["notes"],
                         placeholder="Add visual notes, camera angles, etc...",
-                        height=60
+                        height=60,
+                        on_change=self.update_scene_field,
+                        args=(scene.id, "notes", keys["notes"])
                     )
 
                 with col2:
-                    # Reordering buttons
-                    if st.button("⬆️", key=f"up_{scene['id']}"):
-                        self.move_scene_up(scene['id'])
-                    if st.button("⬇️", key=f"down_{scene['id']}"):
-                        self.move_scene_down(scene['id'])
-                    if st.button("🗑️", key=f"del_{scene['id']}"):
-                        self.delete_scene(scene['id'])
-
-                # Update scene data
-                if new_desc != scene['description']:
-                    scene['description'] = new_desc
-                if new_notes != scene['notes']:
-                    scene['notes'] = new_notes
+                    # Reordering buttons; callbacks run before the fragment reruns
+                    st.button("⬆️", key=keys["up"], on_click=self.move_scene_up, args=(scene.id,))
+                    st.button("⬇️", key=keys["down"], on_click=self.move_scene_down, args=(scene.id,))
+                    st.button("🗑️", key=keys["del"], on_click=self.delete_scene, args=(scene.id,))
 
         # Add new scene
-        if st.button("➕ Add New Scene"):
-            new_scene = {
-                "id": len(st.session_state.storyboard_scenes) + 1,
-                "title": f"Scene {len(st.session_state.storyboard_scenes) + 1}",
-                "description": "New scene description",
-                "notes": "",
-                "order": len(st.session_state.storyboard_scenes) + 1
-            }
-            st.session_state.storyboard_scenes.append(new_scene)
-            st.rerun()
+        st.button("➕ Add New Scene", on_click=self.add_scene)
+
+        self.autosave_project()
 
     def render_storyboard_controls(self):
         """Storyboard controls and tools"""
@@ -897,32 +1320,59 @@ class AIPreProductionStudio:
             if st.button("🖼️ Images", use_container_width=True):
                 st.success("Storyboard exported as images!")
 
+    def next_scene_id(self) -> int:
+        """Hand out scene ids from a monotonic counter so ids are never reused after a delete"""
+        st.session_state.scene_id_counter += 1
+        return st.session_state.scene_id_counter
+
+    def add_scene(self):
+        """Append a new scene to the end of the storyboard"""
+        new_scene = Scene(
+            id=self.next_scene_id(),
+            title=f"Scene {len(st.session_state.scene_order) + 1}",
+            description="New scene description",
+            notes=""
+        )
+        st.session_state.storyboard_scenes[new_scene.id] = new_scene
+        st.session_state.scene_order.append(new_scene.id)
+        st.session_state.scene_id_index[new_scene.id] = len(st.session_state.scene_order) - 1
+        self.mark_dirty()
+
+    def update_scene_field(self, scene_id: int, field_name: str, widget_key: str):
+        """Copy an edited scene text area back into its scene"""
+        setattr(st.session_state.storyboard_scenes[scene_id], field_name, st.session_state[widget_key])
+        self.mark_dirty()
+
     def move_scene_up(self, scene_id: int):
         """Move scene up in order"""
-        scenes = st.session_state.storyboard_scenes
-        scene_index = next(i for i, s in enumerate(scenes) if s['id'] == scene_id)
+        scene_index = st.session_state.scene_id_index[scene_id]
         if scene_index > 0:
-            scenes[scene_index], scenes[scene_index - 1] = scenes[scene_index - 1], scenes[scene_index]
-            self.renumber_scenes()
+            self.swap_scenes(scene_index - 1, scene_index)
 
     def move_scene_down(self, scene_id: int):
         """Move scene down in order"""
-        scenes = st.session_state.storyboard_scenes
-        scene_index = next(i for i, s in enumerate(scenes) if s['id'] == scene_id)
-        if scene_index < len(scenes) - 1:
-            scenes[scene_index], scenes[scene_index + 1] = scenes[scene_index + 1], scenes[scene_index]
-            self.renumber_scenes()
+        scene_index = st.session_state.scene_id_index[scene_id]
+        if scene_index < len(st.session_state.scene_order) - 1:
+            self.swap_scenes(scene_index, scene_index + 1)
+
+    def swap_scenes(self, i: int, j: int):
+        """Swap two positions in the scene order, updating only their index entries"""
+        order = st.session_state.scene_order
+        index = st.session_state.scene_id_index
+        order[i], order[j] = order[j], order[i]
+        index[order[i]], index[order[j]] = i, j
+        self.mark_dirty()
 
     def delete_scene(self, scene_id: int):
         """Delete a scene"""
-        st.session_state.storyboard_scenes = [s for s in st.session_state.storyboard_scenes if s['id'] != scene_id]
-        self.renumber_scenes()
-        st.rerun()
+        st.session_state.storyboard_scenes.pop(scene_id, None)
+        st.session_state.scene_order.pop(st.session_state.scene_id_index[scene_id])
+        self.reindex_scenes()
+        self.mark_dirty()
 
-    def renumber_scenes(self):
-        """Renumber scene orders"""
-        for i, scene in enumerate(st.session_state.storyboard_scenes):
-            scene['order'] = i + 1
+    def reindex_scenes(self):
+        """Rebuild the scene id -> order position index"""
+        st.session_state.scene_id_index = {scene_id: i for i, scene_id in enumerate(st.session_state.scene_order)}
 
     def auto_arrange_scenes(self):
         """Auto-arrange scenes based on content"""
@@ -930,13 +1380,12 @@ class AIPreProductionStudio:
 
     def generate_shot_list(self):
         """Generate shot list from storyboard"""
-        shot_list = []
-        for scene in st.session_state.storyboard_scenes:
-            shot_list.append(f"Scene {scene['order']}: {scene['description']}")
-
+        scenes = st.session_state.storyboard_scenes
         st.subheader("🎥 Generated Shot List")
-        for shot in shot_list:
-            st.write(f"• {shot}")
+        st.markdown("\n".join(
+            f"- Scene {position}: {scenes[scene_id].description}"
+            for position, scene_id in enumerate(st.session_state.scene_order, 1)
+        ))
 
     def render_collaboration_tab(self):
         """Real-time collaboration features"""
@@ -949,6 +1398,7 @@ class AIPreProductionStudio:
         with col2:
             self.render_comment_system()
 
+    @st.fragment
     def render_task_management(self):
         """Task assignment and tracking"""
         st.subheader("✅ Task Management")
@@ -964,38 +1414,72 @@ class AIPreProductionStudio:
 
             if st.form_submit_button("Add Task"):
                 if task_desc:
-                    new_task = {
-                        "id": str(uuid.uuid4()),
-                        "description": task_desc,
-                        "assignee": task_assignee,
-                        "due_date": task_due.strftime("%Y-%m-%d"),
-                        "completed": False,
-                        "created": datetime.now().strftime("%Y-%m-%d")
-                    }
-                    st.session_state.tasks.append(new_task)
+                    new_task = Task(
+                        id=uuid.uuid4().hex,
+                        description=task_desc,
+                        assignee=task_assignee,
+                        due_date=task_due.strftime(_FMT_DATE),
+                        completed=False,
+                        created=datetime.now().strftime(_FMT_DATE)
+                    )
+                    st.session_state.tasks[new_task.id] = new_task
+                    self.mark_dirty()
                     st.success("Task added!")
 
-        # Display tasks
+        # Display and edit tasks in a single table
         st.write("**Current Tasks**")
-        for task in st.session_state.tasks:
-            status = "✅" if task['completed'] else "⏳"
-            st.markdown(f"""
-            <div class="task-item">
-                {status} <strong>{task['assignee']}</strong>: {task['description']}
-                <br><small>Due: {task['due_date']}</small>
-            </div>
-            """, unsafe_allow_html=True)
-
-            col1, col2 = st.columns(2)
-            with col1:
-                if not task['completed'] and st.button("Complete", key=f"complete_{task['id']}"):
-                    task['completed'] = True
-                    st.rerun()
-            with col2:
-                if st.button("Delete", key=f"delete_task_{task['id']}"):
-                    st.session_state.tasks = [t for t in st.session_state.tasks if t['id'] != task['id']]
-                    st.rerun()
+        tasks = st.session_state.tasks.values()
+        task_ids = list(st.session_state.tasks.keys())
+        editor_key = f"tasks_editor_{st.session_state.tasks_editor_version}"
+        st.data_editor(
+            {name: [getattr(task, name) for task in tasks] for name in _TASK_COLUMNS},
+            key=editor_key,
+            num_rows="dynamic",
+            use_container_width=True,
+            column_order=("completed", "description", "assignee", "due_date", "created"),
+            column_config={
+                "completed": st.column_config.CheckboxColumn("Done", default=False),
+                "description": st.column_config.TextColumn("Task", required=True),
+                "assignee": st.column_config.SelectboxColumn(
+                    "Assignee", options=st.session_state.team_members + ["Unassigned"], default="Unassigned",
+                    required=True),
+                "due_date": st.column_config.TextColumn("Due"),
+                "created": st.column_config.TextColumn("Created", disabled=True),
+            },
+            on_change=self.apply_task_edits,
+            args=(editor_key, task_ids)
+        )
 
+        self.autosave_project()
+
+    def apply_task_edits(self, editor_key: str, task_ids: List[str]):
+        """Apply task table edits in one pass, then reset the editor so its deltas are not replayed"""
+        changes = st.session_state[editor_key]
+        tasks = st.session_state.tasks
+        today = datetime.now().strftime(_FMT_DATE)
+
+        for position, updates in changes["edited_rows"].items():
+            task = tasks[task_ids[int(position)]]
+            for column, value in updates.items():
+                setattr(task, column, value)
+        for row in changes["added_rows"]:
+            if row.get("description"):
+                new_task = Task(
+                    id=uuid.uuid4().hex,
+                    description=row["description"],
+                    assignee=row.get("assignee") or "Unassigned",
+                    due_date=row.get("due_date") or today,
+                    completed=bool(row.get("completed", False)),
+                    created=today
+                )
+                tasks[new_task.id] = new_task
+        for position in changes["deleted_rows"]:
+            tasks.pop(task_ids[int(position)], None)
+
+        st.session_state.tasks_editor_version += 1
+        self.mark_dirty()
+
+    @st.fragment
     def render_comment_system(self):
         """Real-time commenting system"""
         st.subheader("💬 Comments & Feedback")
@@ -1010,33 +1494,46 @@ class AIPreProductionStudio:
 
             if st.form_submit_button("Post Comment"):
                 if comment_text:
-                    if comment_section not in st.session_state.comments:
-                        st.session_state.comments[comment_section] = []
-
-                    new_comment = {
-                        "id": str(uuid.uuid4()),
-                        "text": comment_text,
-                        "author": "You",
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                        "section": comment_section
-                    }
-                    st.session_state.comments[comment_section].append(new_comment)
+                    new_comment = Comment(
+                        id=uuid.uuid4().hex,
+                        text=comment_text,
+                        author="You",
+                        timestamp=time.time(),
+                        section=comment_section
+                    )
+                    section_comments = st.session_state.comments[comment_section]
+                    section_comments[new_comment.id] = new_comment
+                    if len(section_comments) > _MAX_COMMENTS_PER_SECTION:
+                        del section_comments[next(iter(section_comments))]
+                    self.mark_dirty()
                     st.success("Comment posted!")
 
-        # Display comments
+        # Display section headers; only the opened section's comments are rendered
         for section, comments in st.session_state.comments.items():
-            with st.expander(f"{section} Comments ({len(comments)})"):
-                for comment in comments:
-                    st.write(f"**{comment['author']}** ({comment['timestamp']}):")
-                    st.write(comment['text'])
-                    st.divider()
+            if not comments:
+                continue
+            if st.button(f"{section} Comments ({len(comments)})", key=f"sec_{section}", use_container_width=True):
+                is_open = st.session_state.open_comment_section == section
+                st.session_state.open_comment_section = None if is_open else section
+
+        open_section = st.session_state.open_comment_section
+        if open_section in st.session_state.comments:
+            st.markdown("".join(
+                _COMMENT_MD.format(author=comment.author, text=comment.text,
+                                   timestamp=_format_epoch(comment.timestamp, _FMT_DATETIME_MINUTES))
+                for comment in islice(reversed(st.session_state.comments[open_section].values()), _COMMENTS_SHOWN)
+            ))
+
+        self.autosave_project()
 
     def add_team_member(self):
         """Add team member"""
         name = st.text_input("Team Member Name")
         if name and st.button("Add"):
-            if name not in st.session_state.team_members:
+            if name not in st.session_state.team_members_set:
+                st.session_state.team_members_set.add(name)
                 st.session_state.team_members.append(name)
+                self.mark_dirty()
                 st.success(f"Added {name} to team!")
 
     def add_research_material(self):
@@ -1046,25 +1543,31 @@ class AIPreProductionStudio:
             content = st.text_area("Research Content")
             if st.form_submit_button("Add Research"):
                 if title and content:
-                    st.session_state.research_materials.append({
+                    research_id = str(uuid.uuid4())
+                    st.session_state.setdefault("research_materials", {})[research_id] = {
+                        "id": research_id,
+                        "type": "Note",
                         "title": title,
                         "content": content,
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
+                        "tags": [],
+                        "timestamp": time.time()
+                    }
+                    self.mark_dirty()
                     st.success("Research material added!")
 
     def create_new_script(self):
         """Create new script"""
-        st.session_state.script_content = ""
+        self.set_script_content("")
         st.session_state.script_versions = []
         st.success("New script created!")
 
     def save_script_version(self):
         """Save script version"""
         st.session_state.script_versions.append({
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": time.time(),
             "content": st.session_state.script_content
         })
+        self.mark_dirty()
         st.success("Script version saved!")
 
     def export_script(self):
@@ -1083,20 +1586,29 @@ class AIPreProductionStudio:
             "character_development": "Emerging",
             "recommendations": ["Develop dialogue further", "Add more visual descriptions"]
         }
-        st.json(analysis)
+        self.render_summary(analysis)
+
+    def render_summary(self, data: Dict):
+        """Render a flat summary dict as markdown bullets, with the raw JSON tucked into an expander"""
+        st.markdown("\n".join(
+            f"- **{key.replace('_', ' ').title()}**: " + (
+                "".join(f"\n    - {item}" for item in value) if isinstance(value, list) else str(value))
+            for key, value in data.items()
+        ))
+        with st.expander("Raw JSON"):
+            st.code(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode(), language="json")
 
     def generate_project_report(self):
         """Generate project report"""
-        report = {
-            "project": st.session_state.current_project,
-            "script_words": len(st.session_state.script_content.split()),
-            "research_items": len(st.session_state.research_materials),
-            "storyboard_scenes": len(st.session_state.storyboard_scenes),
-            "team_members": len(st.session_state.team_members),
-            "completion_estimate": "65%"
-        }
+        report = _project_report(
+            st.session_state.current_project,
+            st.session_state.script_stats["words"],
+            len(st.session_state.research_materials),
+            len(st.session_state.storyboard_scenes),
+            len(st.session_state.team_members)
+        )
         st.subheader("📊 Project Report")
-        st.json(report)
+        self.render_summary(report)
 
 
 if __name__ == "__main__":